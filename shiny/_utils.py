@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import collections.abc
 import contextlib
 import functools
 import importlib
@@ -11,10 +12,9 @@ import random
 import secrets
 import socketserver
 import sys
-import tempfile
 import warnings
 from pathlib import Path
-from types import CoroutineType, ModuleType
+from types import CoroutineType, FunctionType, MethodType, ModuleType
 from typing import (
     Any,
     AsyncIterable,
@@ -42,12 +42,16 @@ def rand_hex(bytes: int) -> str:
     Creates a random hexadecimal string of size `bytes`. The length in
     characters will be bytes*2.
     """
-    format_str = "{{:0{}x}}".format(bytes * 2)
-    return format_str.format(secrets.randbits(bytes * 8))
+    return secrets.token_hex(bytes)
 
 
+# Note that if `x` has no None values, `x` itself is returned rather than a copy.
 def drop_none(x: dict[str, Any]) -> dict[str, object]:
-    return {k: v for k, v in x.items() if v is not None}
+    # Use `is` rather than `None in x.values()`, which would compare values with `==`
+    for v in x.values():
+        if v is None:
+            return {k: v for k, v in x.items() if v is not None}
+    return x
 
 
 # Intended for use with json.load()'s object_hook parameter.
@@ -222,37 +226,46 @@ def random_port(
 # ==============================================================================
 # Private random stream
 # ==============================================================================
+# Shiny's own private stream of randomness, so that generating IDs doesn't disturb (and
+# isn't disturbed by) the user's use of the global `random` module.
+_private_rng = random.Random(secrets.randbits(128))
+# Number of active `private_seed()` contexts
+_private_seed_depth = 0
+
+
 def private_random_int(min: int, max: int) -> str:
-    with private_seed():
+    if _private_seed_depth > 0:
+        # Within `private_seed()`, the global stream is the private stream
         return str(random.randint(min, max))
+    return str(_private_rng.randint(min, max))
 
 
 def private_random_id(prefix: str = "", bytes: int = 3) -> str:
     if prefix != "" and not prefix.endswith("_"):
         prefix += "_"
 
-    with private_seed():
-        return prefix + rand_hex(bytes)
+    return prefix + rand_hex(bytes)
 
 
 @contextlib.contextmanager
 def private_seed() -> Generator[None, None, None]:
+    """
+    Temporarily make the global `random` stream use the private stream's state, so
+    that (for example) `random.seed()` can be used to make the private stream
+    deterministic.
+    """
+    global _private_seed_depth
     state = random.getstate()
-    global own_random_state
+    random.setstate(_private_rng.getstate())
+    _private_seed_depth += 1
     try:
-        random.setstate(own_random_state)
         yield
     finally:
-        own_random_state = random.getstate()
+        _private_seed_depth -= 1
+        _private_rng.setstate(random.getstate())
         random.setstate(state)
 
 
-# Initialize random state for shiny's own private stream of randomness.
-current_random_state = random.getstate()
-random.seed(secrets.randbits(128))
-own_random_state = random.getstate()
-random.setstate(current_random_state)
-
 # ==============================================================================
 # Async-related functions
 # ==============================================================================
@@ -274,10 +287,15 @@ def wrap_async(
 
     fn = cast(Callable[P, R], fn)
 
-    @functools.wraps(fn)
     async def fn_async(*args: P.args, **kwargs: P.kwargs) -> R:
         return fn(*args, **kwargs)
 
+    # The wrapper is only used internally, so rather than copying all the metadata
+    # with functools.wraps(), only set what's useful for debugging and introspection
+    fn_async.__name__ = getattr(fn, "__name__", fn_async.__name__)
+    fn_async.__qualname__ = getattr(fn, "__qualname__", fn_async.__qualname__)
+    fn_async.__wrapped__ = fn  # pyright: ignore[reportFunctionMemberAccess]
+
     return fn_async
 
 
@@ -355,6 +373,9 @@ def is_async_callable(
     """
     if inspect.iscoroutinefunction(obj):
         return True
+    if isinstance(obj, (FunctionType, MethodType)):
+        # A plain function or method's `__call__` is never an `async def` function
+        return False
     if hasattr(obj, "__call__"):  # noqa: B004
         if inspect.iscoroutinefunction(obj.__call__):  # type: ignore
             return True
@@ -387,7 +408,12 @@ def run_coro_sync(coro: Awaitable[R]) -> R:
     regular way (not with `await`) will not bubble up, since it is not awaited
     on.
     """
-    if not inspect.iscoroutine(coro):
+    # The `is` check is a fast path for coroutines created by `async def` functions,
+    # which avoids an `isinstance()` check against the `Coroutine` ABC. Other objects
+    # that implement the `Coroutine` ABC are accepted too.
+    if coro.__class__ is not CoroutineType and not isinstance(
+        coro, collections.abc.Coroutine
+    ):
         raise TypeError("run_coro_sync requires a Coroutine object.")
 
     # Pyright needs a little help here
@@ -536,15 +562,15 @@ class Callbacks:
     def invoke(self) -> None:
         # The list() wrapper is necessary to force collection of all the items before
         # iteration begins. This is necessary because self._callbacks may be mutated
-        # by callbacks.
-        for id, value in list(self._callbacks.items()):
-            fn, once = value
+        # by callbacks. (The dict is bound to a local to avoid repeated attribute
+        # lookups in the loop.)
+        cbs = self._callbacks
+        for id, (fn, once) in list(cbs.items()):
             try:
                 fn()
             finally:
-                if once:
-                    if id in self._callbacks:
-                        del self._callbacks[id]
+                if once and id in cbs:
+                    del cbs[id]
 
     def count(self) -> int:
         return len(self._callbacks)
@@ -571,15 +597,15 @@ class AsyncCallbacks:
     async def invoke(self) -> None:
         # The list() wrapper is necessary to force collection of all the items before
         # iteration begins. This is necessary because self._callbacks may be mutated
-        # by callbacks.
-        for id, value in list(self._callbacks.items()):
-            fn, once = value
+        # by callbacks. (The dict is bound to a local to avoid repeated attribute
+        # lookups in the loop.)
+        cbs = self._callbacks
+        for id, (fn, once) in list(cbs.items()):
             try:
                 await fn()
             finally:
-                if once:
-                    if id in self._callbacks:
-                        del self._callbacks[id]
+                if once and id in cbs:
+                    del cbs[id]
 
     def count(self) -> int:
         return len(self._callbacks)
@@ -591,12 +617,12 @@ class AsyncCallbacks:
 
 
 # Return directory that a package lives in.
+@functools.lru_cache(maxsize=None)
 def package_dir(package: str) -> str:
-    with tempfile.TemporaryDirectory():
-        pkg_file = importlib.import_module(".", package=package).__file__
-        if pkg_file is None:
-            raise RuntimeError(f"Could not find package dir for '{package}'")
-        return os.path.dirname(pkg_file)
+    pkg_file = importlib.import_module(".", package=package).__file__
+    if pkg_file is None:
+        raise RuntimeError(f"Could not find package dir for '{package}'")
+    return os.path.dirname(pkg_file)
 
 
 class ModuleImportWarning(ImportWarning):
@@ -56,11 +56,14 @@ if "pyodide" not in sys.modules:
 else:
     # Running in wasm mode; must use our own simple StaticFiles
 
+    import functools
+    import mimetypes
     import os
     import os.path
     import pathlib
+    import stat
     import urllib.parse
-    from typing import Iterable, MutableMapping, Optional
+    from typing import MutableMapping, Optional
 
     from starlette.responses import PlainTextResponse
     from starlette.types import Receive, Scope, Send
@@ -71,6 +74,9 @@ else:
 
         def __init__(self, *, directory: str | os.PathLike[str]):
             self.dir = pathlib.Path(os.path.realpath(os.path.normpath(directory)))
+            self._dir_str = os.fspath(self.dir)
+            # With a trailing separator, so that e.g. /foo doesn't match /foobar
+            self._dir_prefix = os.path.join(self._dir_str, "")
 
         async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
             if scope["type"] != "http":
@@ -79,69 +85,80 @@ else:
             root_path = scope.get("route_root_path", scope.get("root_path", ""))
             path = scope.get("route_path", re.sub(r"^" + root_path, "", scope["path"]))
             path_segments = path.split("/")
-            final_path, trailing_slash = _traverse_url_path(self.dir, path_segments)
+            final_path, trailing_slash = _traverse_url_path(
+                self._dir_str, path_segments
+            )
             if final_path is None:
-                return await Error404()(scope, receive, send)
+                return await _error_404(scope, receive, send)
 
-            if not final_path.exists():
-                return await Error404()(scope, receive, send)
+            # Sanity check that final path is under self.dir, and if not, 404. This
+            # is like .is_relative_to(), but avoids constructing intermediate paths.
+            if final_path != self._dir_str and not final_path.startswith(
+                self._dir_prefix
+            ):
+                return await _error_404(scope, receive, send)
 
-            # Sanity check that final path is under self.dir, and if not, 404
-            # This construction is like .is_relative_to, but works with Python 3.8
+            # A single stat() call tells us both whether the path exists and whether
+            # it's a directory
             try:
-                final_path.relative_to(self.dir)
-            except ValueError:
-                return await Error404()(scope, receive, send)
+                st = os.stat(final_path)
+            except OSError:
+                return await _error_404(scope, receive, send)
 
             # Serve up the path
 
-            if final_path.is_dir():
+            if stat.S_ISDIR(st.st_mode):
                 if trailing_slash:
                     # We could serve up index.html or directory listing if we wanted
-                    return await Error404()(scope, receive, send)
+                    return await _error_404(scope, receive, send)
                 else:
                     # We could redirect with an added "/" if we wanted
-                    return await Error404()(scope, receive, send)
+                    return await _error_404(scope, receive, send)
             else:
                 return await FileResponse(final_path)(scope, receive, send)
 
     def _traverse_url_path(
-        dir: pathlib.Path, path_segments: list[str]
-    ) -> tuple[Optional[pathlib.Path], bool]:
+        dir: str, path_segments: list[str]
+    ) -> tuple[Optional[str], bool]:
         assert len(path_segments) > 0
 
+        unquote = urllib.parse.unquote
+        join = os.path.join
         new_dir = dir
-        path_segment = urllib.parse.unquote(path_segments.pop(0))
-        # Gratuitous whitespace is not allowed
-        if path_segment != path_segment.strip():
-            return None, False
+        path_segment = ""
+        for raw_segment in path_segments:
+            path_segment = unquote(raw_segment)
+            # Gratuitous whitespace is not allowed
+            if path_segment != path_segment.strip():
+                return None, False
 
-        # Check for illegal paths
-        if "/" in path_segment:
-            return None, False
-        elif path_segment == ".." or path_segment == ".":
-            return None, False
+            # Check for illegal paths
+            if "/" in path_segment:
+                return None, False
+            elif path_segment == ".." or path_segment == ".":
+                return None, False
 
-        if path_segment != "":
-            new_dir = dir / path_segment
+            if path_segment != "":
+                new_dir = join(new_dir, path_segment)
 
-        if len(path_segments) == 0:
-            return new_dir, path_segment == ""
-        else:
-            return _traverse_url_path(new_dir, path_segments)
+        # An empty final segment means the URL path had a trailing slash
+        return new_dir, path_segment == ""
 
     class Error404(PlainTextResponse):
         def __init__(self):
             super().__init__("404", status_code=404)  # type: ignore
 
+    # Responses can be called any number of times, so share a single instance
+    _error_404 = Error404()
+
     class FileResponse:
-        file: pathlib.Path
+        file: str | os.PathLike[str]
         headers: Optional[MutableMapping[str, str]]
         media_type: str
 
         def __init__(
             self,
-            file: pathlib.Path,
+            file: str | os.PathLike[str],
             headers: Optional[MutableMapping[str, str]] = None,
             media_type: Optional[str] = None,
             background: Optional[BackgroundTask] = None,
@@ -151,43 +168,81 @@ else:
             self.background = background
 
             if media_type is None:
-                media_type = _utils.guess_mime_type(file, strict=False)
+                media_type = _guess_mime_type_by_suffix(_mime_type_suffix(file))
             self.media_type = media_type
 
+            self._encoded_headers = _encode_headers(headers, media_type)
+            self._has_content_length = headers is not None and any(
+                k.lower() == "content-length" for k in headers
+            )
+
         async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-            with open(self.file, "rb") as f:
+            # All reads below are in large chunks, so skip the BufferedReader layer
+            # and have each read() go straight into its own bytes object. (Reading
+            # into a reused buffer isn't safe, since the receiver of `send()` may
+            # hold on to the body after the call returns.)
+            with open(self.file, "rb", buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+                headers = self._encoded_headers
+                if not self._has_content_length:
+                    headers = [
+                        *headers,
+                        (b"Content-Length", str(size).encode("latin-1")),
+                    ]
                 await send(
                     {
                         "type": "http.response.start",
                         "status": 200,
-                        "headers": _convert_headers(self.headers, self.media_type),
+                        "headers": headers,
                     }
                 )
 
-                while True:
-                    # In pyodide mode (the only mode in which we use this codepath) the
-                    # `send()` callback has quite a bit of per-call overhead, so use a
-                    # very large chunk size to keep performance adequate.
-                    data = f.read(262144)
-                    if len(data) == 0:
-                        break
+                # In pyodide mode (the only mode in which we use this codepath) the
+                # `send()` callback has quite a bit of per-call overhead, so send
+                # small files in a single call, and otherwise use a very large chunk
+                # size to keep performance adequate.
+                if size <= 1048576:
                     await send(
                         {
                             "type": "http.response.body",
-                            "body": data,
-                            "more_body": True,
+                            "body": f.read(),
+                            "more_body": False,
                         }
                     )
+                else:
+                    while True:
+                        data = f.read(262144)
+                        if len(data) == 0:
+                            break
+                        await send(
+                            {
+                                "type": "http.response.body",
+                                "body": data,
+                                "more_body": True,
+                            }
+                        )
 
-                await send(
-                    {"type": "http.response.body", "body": b"", "more_body": False}
-                )
+                    await send(
+                        {"type": "http.response.body", "body": b"", "more_body": False}
+                    )
             if self.background:
                 await self.background()
 
-    def _convert_headers(
+    @functools.lru_cache(maxsize=512)
+    def _guess_mime_type_by_suffix(suffix: str) -> str:
+        return _utils.guess_mime_type("x" + suffix, strict=False)
+
+    def _mime_type_suffix(file: str | os.PathLike[str]) -> str:
+        root, suffix = os.path.splitext(file)
+        # For encodings like .gz, the type comes from the suffix before it (e.g. a
+        # .tar.gz file is application/x-tar)
+        if suffix in mimetypes.encodings_map:
+            suffix = os.path.splitext(root)[1] + suffix
+        return suffix
+
+    def _encode_headers(
         headers: Optional[MutableMapping[str, str]], media_type: Optional[str] = None
-    ) -> Iterable[tuple[bytes, bytes]]:
+    ) -> list[tuple[bytes, bytes]]:
         if headers is None:
             headers = {}
 
@@ -195,10 +250,11 @@ else:
             (k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()
         ]
         if media_type is not None:
-            header_list += [
-                (
-                    b"Content-Type",
-                    media_type.encode("latin-1"),
-                )
-            ]
+            header_list.append(_content_type_header(media_type))
         return header_list
+
+    # Static files are served with a small set of media types, so the encoded
+    # Content-Type header can be reused across responses.
+    @functools.lru_cache(maxsize=256)
+    def _content_type_header(media_type: str) -> tuple[bytes, bytes]:
+        return (b"Content-Type", media_type.encode("latin-1"))
@@ -0,0 +1,140 @@
+"""Tests for the wasm (pyodide) implementation in `shiny.http_staticfiles`."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+from typing import Any, Generator
+
+import pytest
+
+import shiny
+
+
+@pytest.fixture(scope="module")
+def wasm_staticfiles() -> Generator[types.ModuleType, None, None]:
+    """
+    Load a separate copy of `shiny.http_staticfiles` with a fake `pyodide` module
+    present, so that the wasm code path is used.
+    """
+    had_pyodide = "pyodide" in sys.modules
+    if not had_pyodide:
+        sys.modules["pyodide"] = types.ModuleType("pyodide")
+    try:
+        name = "shiny._http_staticfiles_wasm"
+        spec = importlib.util.spec_from_file_location(
+            name, Path(shiny.__file__).parent / "http_staticfiles.py"
+        )
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if not had_pyodide:
+            del sys.modules["pyodide"]
+
+    # Make sure we really got the wasm implementation
+    assert hasattr(module, "_traverse_url_path")
+    yield module
+
+
+async def serve(
+    wasm_staticfiles: types.ModuleType, directory: Path, path: str
+) -> list[dict[str, Any]]:
+    messages: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    app = wasm_staticfiles.StaticFiles(directory=directory)
+    await app({"type": "http", "path": path, "root_path": ""}, receive, send)
+    return messages
+
+
+def response_status(messages: list[dict[str, Any]]) -> int:
+    return messages[0]["status"]
+
+
+def response_body(messages: list[dict[str, Any]]) -> bytes:
+    return b"".join(m.get("body", b"") for m in messages[1:])
+
+
+@pytest.mark.parametrize(
+    "file, media_type",
+    [
+        ("archive.tar.gz", "application/x-tar"),
+        ("data.csv.gz", "text/csv"),
+        ("image.svgz", "image/svg+xml"),
+        ("script.js", "text/javascript"),
+        ("dir.d/README", "application/octet-stream"),
+        ("file.gz", "application/octet-stream"),
+    ],
+)
+def test_file_response_media_type(
+    wasm_staticfiles: types.ModuleType, file: str, media_type: str
+):
+    assert wasm_staticfiles.FileResponse(f"/www/{file}").media_type == media_type
+
+
+def test_traverse_url_path(wasm_staticfiles: types.ModuleType):
+    traverse = wasm_staticfiles._traverse_url_path
+    root = "/www"
+
+    assert traverse(root, [""]) == ("/www", True)
+    assert traverse(root, ["", ""]) == ("/www", True)
+    assert traverse(root, ["", "a"]) == ("/www/a", False)
+    assert traverse(root, ["", "a", ""]) == ("/www/a", True)
+    assert traverse(root, ["", "a", "", "b"]) == ("/www/a/b", False)
+    assert traverse(root, ["", "a%20b"]) == ("/www/a b", False)
+
+    for bad in ["..", ".", "%2e%2e", "a%2Fb", " a", "a "]:
+        assert traverse(root, ["", bad]) == (None, False)
+
+
+@pytest.mark.asyncio
+async def test_static_files(wasm_staticfiles: types.ModuleType, tmp_path: Path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "hello.txt").write_bytes(b"hello")
+    (tmp_path.parent / "secret.txt").write_bytes(b"secret")
+
+    messages = await serve(wasm_staticfiles, tmp_path, "/sub/hello.txt")
+    assert response_status(messages) == 200
+    assert (b"Content-Length", b"5") in messages[0]["headers"]
+    assert response_body(messages) == b"hello"
+    # Small files are sent in a single body message
+    assert len(messages) == 2
+    assert messages[-1]["more_body"] is False
+
+    for path in [
+        "/missing.txt",
+        "/sub",
+        "/sub/",
+        "/",
+        "/../secret.txt",
+        "/%2e%2e/secret.txt",
+        "/sub%2Fhello.txt",
+    ]:
+        messages = await serve(wasm_staticfiles, tmp_path, path)
+        assert response_status(messages) == 404, path
+
+
+@pytest.mark.asyncio
+async def test_static_files_large(wasm_staticfiles: types.ModuleType, tmp_path: Path):
+    data = bytes(range(256)) * 8192  # 2MB
+    (tmp_path / "large.bin").write_bytes(data)
+
+    messages = await serve(wasm_staticfiles, tmp_path, "/large.bin")
+    assert response_status(messages) == 200
+    assert (b"Content-Length", str(len(data)).encode()) in messages[0]["headers"]
+    assert response_body(messages) == data
+    # Large files are sent in chunks, followed by an empty final message
+    assert len(messages) > 3
+    assert messages[-1] == {
+        "type": "http.response.body",
+        "body": b"",
+        "more_body": False,
+    }
@@ -1,10 +1,16 @@
 import random
 import socketserver
-from typing import List, Set
+from typing import Callable, Dict, List, Optional, Set
 
 import pytest
 
-from shiny._utils import AsyncCallbacks, Callbacks, private_seed, random_port
+from shiny._utils import (
+    AsyncCallbacks,
+    Callbacks,
+    private_random_int,
+    private_seed,
+    random_port,
+)
 from shiny.ui._utils import extract_js_keys, js_eval
 
 
@@ -50,6 +56,27 @@ def test_randomness():
         random.setstate(current_state)
 
 
+def test_private_random_int():
+    current_state = random.getstate()
+    try:
+        # The private stream doesn't touch the global stream
+        random.seed(0)
+        private_random_int(0, 100000000)
+        pub = random.randint(0, 100000000)
+        random.seed(0)
+        assert random.randint(0, 100000000) == pub
+
+        # Within private_seed(), seeding makes the private stream deterministic
+        with private_seed():
+            random.seed(0)
+            priv = private_random_int(0, 100000000)
+        with private_seed():
+            random.seed(0)
+            assert private_random_int(0, 100000000) == priv
+    finally:
+        random.setstate(current_state)
+
+
 def test_callbacks():
     class MockCallback:
         def __init__(self):
@@ -137,6 +164,134 @@ async def test_async_callbacks():
     assert cb4.exec_count == 1  # Registered during previous invoke(), was called
 
 
+def test_callbacks_unregister_during_invoke():
+    callbacks = Callbacks()
+    calls: List[str] = []
+    handles: Dict[str, Callable[[], None]] = {}
+
+    def make_cb(name: str, unregister: Optional[List[str]] = None):
+        def cb():
+            calls.append(name)
+            for other in unregister or []:
+                handles[other]()
+
+        return cb
+
+    # "a" unregisters itself, the next callback, and a later callback
+    handles["a"] = callbacks.register(make_cb("a", ["a", "b", "d"]))
+    handles["b"] = callbacks.register(make_cb("b"))
+    handles["c"] = callbacks.register(make_cb("c"))
+    handles["d"] = callbacks.register(make_cb("d"))
+    assert callbacks.count() == 4
+
+    # Every callback registered when invoke() started is called, even if it was
+    # unregistered during this invoke()
+    callbacks.invoke()
+    assert calls == ["a", "b", "c", "d"]
+    assert callbacks.count() == 1
+
+    calls.clear()
+    callbacks.invoke()
+    assert calls == ["c"]
+
+
+def test_callbacks_register_during_invoke():
+    callbacks = Callbacks()
+    calls: List[str] = []
+
+    def a():
+        calls.append("a")
+        callbacks.register(lambda: calls.append("b"))
+
+    callbacks.register(a, once=True)
+    callbacks.invoke()
+    assert calls == ["a"]
+    assert callbacks.count() == 1
+
+    calls.clear()
+    callbacks.invoke()
+    assert calls == ["b"]
+
+
+def test_callbacks_once_raises():
+    callbacks = Callbacks()
+    calls: List[str] = []
+
+    def a():
+        calls.append("a")
+        raise ValueError("boom")
+
+    callbacks.register(a, once=True)
+    callbacks.register(lambda: calls.append("b"))
+
+    with pytest.raises(ValueError, match="boom"):
+        callbacks.invoke()
+    assert calls == ["a"]
+    # The once=True callback is removed even though it raised
+    assert callbacks.count() == 1
+
+    calls.clear()
+    callbacks.invoke()
+    assert calls == ["b"]
+
+
+def test_callbacks_count():
+    callbacks = Callbacks()
+    handle = callbacks.register(lambda: None)
+    callbacks.register(lambda: None)
+    assert callbacks.count() == 2
+
+    # Unregistering more than once only counts once
+    handle()
+    handle()
+    assert callbacks.count() == 1
+
+
+@pytest.mark.asyncio
+async def test_async_callbacks_mutation():
+    callbacks = AsyncCallbacks()
+    calls: List[str] = []
+    handles: Dict[str, Callable[[], None]] = {}
+
+    async def a():
+        calls.append("a")
+        handles["a"]()
+        handles["b"]()
+        handles["d"]()
+        callbacks.register(e)
+
+    async def b():
+        calls.append("b")
+
+    async def c():
+        calls.append("c")
+        raise ValueError("boom")
+
+    async def d():
+        calls.append("d")
+
+    async def e():
+        calls.append("e")
+
+    handles["a"] = callbacks.register(a)
+    handles["b"] = callbacks.register(b)
+    handles["c"] = callbacks.register(c, once=True)
+    handles["d"] = callbacks.register(d)
+
+    with pytest.raises(ValueError, match="boom"):
+        await callbacks.invoke()
+    assert calls == ["a", "b", "c"]
+    # "a", "b", "d" were unregistered, once=True "c" was removed, and "e" was added
+    assert callbacks.count() == 1
+
+    handles["d"]()
+    assert callbacks.count() == 1
+
+    calls.clear()
+    await callbacks.invoke()
+    assert calls == ["e"]
+
+
 # Timeout within 2 seconds
 @pytest.mark.timeout(2)
 @pytest.mark.flaky(reruns=3)
@@ -2,11 +2,16 @@
 
 import asyncio
 import contextvars
-from typing import Iterator, List
+from typing import Any, Coroutine, Generator, Iterator, List
 
 import pytest
 
-from shiny._utils import run_coro_hybrid, run_coro_sync
+from shiny._utils import (
+    is_async_callable,
+    run_coro_hybrid,
+    run_coro_sync,
+    wrap_async,
+)
 
 
 def range_sync(n: int) -> Iterator[int]:
@@ -94,6 +99,81 @@ def test_run_coro_sync_type_check():
     with pytest.raises(TypeError):
         run_coro_sync(range_sync(0))  # type: ignore
 
+    # Objects implementing the Coroutine ABC (not just native coroutines) are accepted
+    class FinishedCoroutine(Coroutine[Any, Any, int]):
+        def send(self, value: Any) -> Any:
+            raise StopIteration(42)
+
+        def throw(self, *args: Any, **kwargs: Any) -> Any:
+            raise StopIteration(42)
+
+        def __await__(self) -> Generator[Any, Any, int]:
+            yield
+            return 42
+
+    assert run_coro_sync(FinishedCoroutine()) == 42
+
+
+def test_is_async_callable():
+    def sync_fn() -> None:
+        pass
+
+    async def async_fn() -> None:
+        pass
+
+    class AsyncCallable:
+        async def __call__(self) -> None:
+            pass
+
+    class SyncCallable:
+        def __call__(self) -> None:
+            pass
+
+        async def method(self) -> None:
+            pass
+
+    assert not is_async_callable(sync_fn)
+    assert is_async_callable(async_fn)
+    assert is_async_callable(AsyncCallable())
+    assert not is_async_callable(SyncCallable())
+    assert is_async_callable(SyncCallable().method)
+
+
+def test_wrap_async():
+    def add_one(x: int) -> int:
+        return x + 1
+
+    async def add_two(x: int) -> int:
+        return x + 2
+
+    add_one_async = wrap_async(add_one)
+    assert is_async_callable(add_one_async)
+    assert add_one_async.__name__ == "add_one"
+    assert add_one_async.__wrapped__ is add_one  # type: ignore
+    assert run_coro_sync(add_one_async(1)) == 2
+
+    # Callables that compare equal still each get their own wrapper
+    class Adder:
+        def __init__(self, n: int) -> None:
+            self.n = n
+
+        def __call__(self, x: int) -> int:
+            return x + self.n
+
+        def __eq__(self, other: object) -> bool:
+            return isinstance(other, Adder)
+
+        def __hash__(self) -> int:
+            return 0
+
+    add_three = Adder(3)
+    add_four = Adder(4)
+    assert run_coro_sync(wrap_async(add_three)(1)) == 4
+    assert run_coro_sync(wrap_async(add_four)(1)) == 5
+
+    # Async functions are returned unchanged
+    assert wrap_async(add_two) is add_two
+
 
 def test_async_generator():
     # run_coro_sync() can't run async generators, but it can run async functions